@@ -9,7 +9,7 @@ import random
 import logging
 import requests
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from bs4 import BeautifulSoup
 try:
     from email_validator import validate_email, EmailNotValidError
@@ -37,6 +37,9 @@ class BusinessCollector:
     def __init__(self):
         """Initialize the business collector with comprehensive business database"""
         self.verified_businesses = self._load_verified_businesses()
+        # Category/city lists derived from verified_businesses, built on first use
+        self._categories: Optional[Tuple[str, ...]] = None
+        self._cities: Optional[Tuple[str, ...]] = None
         self.last_scraping_stats = {}
         self.session = requests.Session()
         self.session.headers.update({
@@ -1132,14 +1135,18 @@ class BusinessCollector:
     
     def get_categories(self) -> List[str]:
         """Get available categories"""
-        return list(self.verified_businesses.keys())
+        if self._categories is None:
+            self._categories = tuple(self.verified_businesses.keys())
+        return list(self._categories)
     
     def get_cities(self) -> List[str]:
         """Get available cities"""
-        cities = set()
-        for category_data in self.verified_businesses.values():
-            if isinstance(category_data, dict):
-                for city in category_data.keys():
-                    if city != "related_types":
-                        cities.add(city)
-        return list(cities)
+        if self._cities is None:
+            cities = set()
+            for category_data in self.verified_businesses.values():
+                if isinstance(category_data, dict):
+                    for city in category_data.keys():
+                        if city != "related_types":
+                            cities.add(city)
+            self._cities = tuple(cities)
+        return list(self._cities)
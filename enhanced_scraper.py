@@ -315,22 +315,10 @@ class EnhancedScraper:
             logger.error(f"Unknown source: {source_name}")
             return []
         
-        source_config = self.business_sources[source_name]
         businesses = []
         
         try:
-            # Construct search URL
-            if "{category}" in source_config["search_pattern"] and "{city}" in source_config["search_pattern"]:
-                search_url = source_config["base_url"] + "/" + source_config["search_pattern"].format(
-                    category=quote_plus(category),
-                    city=quote_plus(city)
-                )
-            else:
-                query = f"{category} {city} pakistan"
-                search_url = source_config["base_url"] + "/" + source_config["search_pattern"].format(
-                    query=quote_plus(query)
-                )
-            
+            search_url = self._build_search_url(source_name, category, city)
             logger.info(f"🔍 Scraping {source_name}: {search_url}")
             
             # Make request
@@ -338,36 +326,58 @@ class EnhancedScraper:
             if not response:
                 return []
             
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find business listings
-            business_elements = []
-            for selector in source_config["business_selectors"]:
-                elements = soup.select(selector)
-                if elements:
-                    business_elements.extend(elements)
-                    break
-            
-            if not business_elements:
-                logger.warning(f"No business elements found in {source_name}")
-                return []
-            
-            logger.info(f"Found {len(business_elements)} business elements in {source_name}")
-            
-            # Extract business data
-            for element in business_elements[:20]:  # Limit to 20 per source
-                business_data = self._extract_business_from_element(
-                    element, source_config, category, city, source_name
-                )
-                if business_data:
-                    businesses.append(business_data)
+            businesses = self._parse_business_listings(response.content, source_name, category, city)
             
         except Exception as e:
             logger.error(f"Error scraping {source_name}: {e}")
         
         return businesses
     
+    def _build_search_url(self, source_name: str, category: str, city: str) -> str:
+        """Construct the search URL for a directory source"""
+        source_config = self.business_sources[source_name]
+        if "{category}" in source_config["search_pattern"] and "{city}" in source_config["search_pattern"]:
+            return source_config["base_url"] + "/" + source_config["search_pattern"].format(
+                category=quote_plus(category),
+                city=quote_plus(city)
+            )
+        query = f"{category} {city} pakistan"
+        return source_config["base_url"] + "/" + source_config["search_pattern"].format(
+            query=quote_plus(query)
+        )
+    
+    def _parse_business_listings(self, content: bytes, source_name: str, category: str, city: str) -> List[ScrapedBusiness]:
+        """Extract businesses from a directory search results page"""
+        source_config = self.business_sources[source_name]
+        businesses = []
+        
+        # Parse HTML
+        soup = BeautifulSoup(content, 'html.parser')
+        
+        # Find business listings
+        business_elements = []
+        for selector in source_config["business_selectors"]:
+            elements = soup.select(selector)
+            if elements:
+                business_elements.extend(elements)
+                break
+        
+        if not business_elements:
+            logger.warning(f"No business elements found in {source_name}")
+            return []
+        
+        logger.info(f"Found {len(business_elements)} business elements in {source_name}")
+        
+        # Extract business data
+        for element in business_elements[:20]:  # Limit to 20 per source
+            business_data = self._extract_business_from_element(
+                element, source_config, category, city, source_name
+            )
+            if business_data:
+                businesses.append(business_data)
+        
+        return businesses
+    
     def _extract_business_from_element(self, element, source_config: Dict, category: str, city: str, source_name: str) -> Optional[ScrapedBusiness]:
         """Extract business information from HTML element"""
         try:
@@ -434,8 +444,11 @@ class EnhancedScraper:
                 except Exception as e:
                     logger.error(f"❌ {source_name}: {e}")
         
-        # Remove duplicates and sort by confidence
-        unique_businesses = self._remove_duplicates(all_businesses)
+        return self._rank_businesses(all_businesses, max_businesses)
+    
+    def _rank_businesses(self, businesses: List[ScrapedBusiness], max_businesses: int) -> List[ScrapedBusiness]:
+        """Remove duplicates, sort by confidence and keep the best max_businesses"""
+        unique_businesses = self._remove_duplicates(businesses)
         sorted_businesses = sorted(unique_businesses, key=lambda x: x.confidence_score, reverse=True)
         
         # Limit results
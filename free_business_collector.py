@@ -7,20 +7,84 @@ Uses free APIs and enhanced scraping techniques
 import json
 import random
 import logging
-import requests
+import sys
+import threading
 import time
-from typing import List, Dict, Any, Optional
+import urllib3
+from typing import List, Dict, Any, Optional, Tuple
 from bs4 import BeautifulSoup
 import re
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urlencode
+from email.utils import parsedate_to_datetime
 import concurrent.futures
+from collections import OrderedDict
 from dataclasses import dataclass
 
+try:
+    import xxhash
+except ImportError:
+    # Fallback: deduplicate on plain (name, phone) tuple keys
+    xxhash = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Precompiled extraction patterns
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+# Optional +92 prefix, then 8-15 digits with at most one space/dash between digits
+_PHONE_RE = re.compile(r'(?:\+92[\s-]?)?(?:\d[\s-]?){7,14}\d')
+_ADDRESS_RES = (
+    re.compile(r'Address[:\s]*([^,\n]+)'),
+    re.compile(r'Location[:\s]*([^,\n]+)'),
+    re.compile(r'([^,\n]+(?:Street|Road|Avenue|Lane|Plaza|Mall|Center))')
+)
+_NAME_SELECTOR = 'h1, h2, h3, h4, strong, b'
+# Listing containers: div/li/tr whose class contains one of the keywords (case-insensitive)
+_LISTING_SELECTOR = ', '.join(
+    f'{tag}[class*={keyword} i]'
+    for tag in ('div', 'li', 'tr')
+    for keyword in ('business', 'company', 'listing', 'item')
+)
+
+# Supported categories and cities (immutable, shared by every collector)
+_CATEGORIES = (
+    "Technology", "Healthcare", "Education", "Finance", "Real Estate",
+    "Restaurant", "Retail", "Manufacturing", "Consulting", "Legal",
+    "Marketing", "Transportation", "Construction", "Entertainment", "Automotive"
+)
+_CITIES = (
+    "Karachi", "Lahore", "Islamabad", "Rawalpindi", "Faisalabad",
+    "Multan", "Peshawar", "Quetta", "Gujranwala", "Sialkot",
+    "Bahawalpur", "Sargodha", "Sukkur", "Jhang", "Sheikhupura"
+)
+_CITIES_LC = frozenset(c.lower() for c in _CITIES)
+
+def _find_phone(text: str) -> Optional[str]:
+    """Return the first phone-like number in text, if any"""
+    match = _PHONE_RE.search(text)
+    return match.group(0) if match else None
+
+# Status codes that signal the host wants us to slow down
+_THROTTLE_STATUSES = frozenset((429, 503))
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+# Slotted dataclasses need Python 3.10+; older interpreters keep a plain __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_SLOTS)
 class BusinessData:
     """Structured business data"""
     name: str
@@ -39,10 +103,15 @@ class FreeBusinessCollector:
     
     def __init__(self):
         """Initialize the free business collector"""
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+        # Pooled urllib3 client; keeps connections alive without requests' per-call overhead
+        self.http = urllib3.PoolManager(
+            maxsize=32,
+            retries=urllib3.Retry(3, backoff_factor=0.3),
+            timeout=urllib3.Timeout(connect=3, read=10),
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+            }
+        )
         
         # Free API endpoints
         self.nominatim_base = "https://nominatim.openstreetmap.org"
@@ -55,29 +124,98 @@ class FreeBusinessCollector:
             "pakistan_companies": "https://www.pakistan-companies.com"
         }
         
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_delay = 1  # 1 second between requests
+        # Adaptive per-host rate limiting
+        self.min_delay = 1  # Starting delay between requests to the same host
+        self.delay_floor = 0.2  # Successful requests decay the delay toward this
+        self.max_delay = 60  # Cap for server-requested back-off
+        self.max_throttle_retries = 2
+        self._host_last: Dict[str, float] = {}
+        self._host_delay: Dict[str, float] = {}
+        
+        # Bounded LRU of response bodies (URL -> (fetched_at, body)) so repeat URLs skip the network
+        self.response_cache_size = 512
+        self.response_cache_ttl = 600  # seconds
+        self._resp_cache: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._resp_lock = threading.Lock()
         
-    def _rate_limit(self):
-        """Implement rate limiting"""
-        current_time = time.time()
-        if current_time - self.last_request_time < self.min_delay:
-            time.sleep(self.min_delay - (current_time - self.last_request_time))
-        self.last_request_time = time.time()
+        # Deduplicate on 64-bit xxhash fingerprints; set False for exact tuple keys
+        self.fingerprint_dedup = True
+        
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        """Close pooled connections and drop cached responses"""
+        self.http.clear()
+        with self._resp_lock:
+            self._resp_cache.clear()
+    
+    def _rate_limit(self, host: str):
+        """Wait out the current delay for a host since its last request"""
+        delay = self._host_delay.get(host, self.min_delay)
+        elapsed = time.time() - self._host_last.get(host, 0)
+        if elapsed < delay:
+            time.sleep(delay - elapsed)
+        self._host_last[host] = time.time()
+    
+    def _fetch(self, url: str, params: Optional[Dict[str, Any]] = None) -> bytes:
+        """Return the body of a GET, served from the response cache while fresh"""
+        cache_key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+        
+        with self._resp_lock:
+            cached = self._resp_cache.get(cache_key)
+            if cached and time.time() - cached[0] < self.response_cache_ttl:
+                self._resp_cache.move_to_end(cache_key)
+                return cached[1]
+        
+        body = self._request(url, params).data
+        
+        with self._resp_lock:
+            self._resp_cache[cache_key] = (time.time(), body)
+            self._resp_cache.move_to_end(cache_key)
+            while len(self._resp_cache) > self.response_cache_size:
+                self._resp_cache.popitem(last=False)
+        
+        return body
+    
+    def _request(self, url: str, params: Optional[Dict[str, Any]] = None) -> urllib3.HTTPResponse:
+        """Issue a rate-limited GET through the connection pool, raising on HTTP error statuses"""
+        host = urlparse(url).netloc
+        
+        for attempt in range(self.max_throttle_retries + 1):
+            self._rate_limit(host)
+            response = self.http.request('GET', url, fields=params)
+            delay = self._host_delay.get(host, self.min_delay)
+            
+            if response.status not in _THROTTLE_STATUSES:
+                # Cooperative host: drift back toward the floor
+                self._host_delay[host] = max(self.delay_floor, delay * 0.9)
+                break
+            
+            # Throttled: honour Retry-After, otherwise double the delay
+            retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+            backoff = min(self.max_delay, retry_after if retry_after is not None else delay * 2)
+            self._host_delay[host] = max(delay, backoff)
+            if attempt < self.max_throttle_retries:
+                logger.warning(f"{host} throttled ({response.status}), backing off {backoff:.1f}s")
+                time.sleep(backoff)
+        
+        if response.status >= 400:
+            raise urllib3.exceptions.HTTPError(f"{response.status} error for url: {url}")
+        return response
     
     def search_businesses_duckduckgo(self, query: str, city: str) -> List[BusinessData]:
         """Search for businesses using DuckDuckGo (free)"""
         try:
-            self._rate_limit()
-            
             # DuckDuckGo doesn't have a public API, but we can scrape their results
             search_url = f"https://duckduckgo.com/html/?q={query}+{city}+pakistan+business"
             
-            response = self.session.get(search_url)
-            response.raise_for_status()
+            content = self._fetch(search_url)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(content, 'html.parser')
             businesses = []
             
             # Extract business information from search results
@@ -107,12 +245,10 @@ class FreeBusinessCollector:
                 # Try to extract more details from snippet
                 if snippet_text:
                     # Extract phone numbers
-                    phone_match = re.search(r'(\+92[\d\s-]+|[\d\s-]{10,})', snippet_text)
-                    if phone_match:
-                        business.phone = phone_match.group(1)
+                    business.phone = _find_phone(snippet_text)
                     
                     # Extract email addresses
-                    email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', snippet_text)
+                    email_match = _EMAIL_RE.search(snippet_text)
                     if email_match:
                         business.email = email_match.group(0)
                 
@@ -128,8 +264,6 @@ class FreeBusinessCollector:
     def get_location_data_nominatim(self, city: str, country: str = "Pakistan") -> Optional[Dict]:
         """Get location data using OpenStreetMap Nominatim (free)"""
         try:
-            self._rate_limit()
-            
             search_query = f"{city}, {country}"
             url = f"{self.nominatim_base}/search"
             params = {
@@ -138,10 +272,9 @@ class FreeBusinessCollector:
                 'limit': 1
             }
             
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
+            content = self._fetch(url, params=params)
             
-            data = response.json()
+            data = json.loads(content)
             if data:
                 location = data[0]
                 return {
@@ -164,8 +297,6 @@ class FreeBusinessCollector:
         # Enhanced scraping with multiple sources
         for source_name, base_url in self.scraping_sources.items():
             try:
-                self._rate_limit()
-                
                 # Construct search URL based on source
                 if "pakistan_business_directory" in source_name:
                     search_url = f"{base_url}/search?q={category}+{city}"
@@ -174,13 +305,12 @@ class FreeBusinessCollector:
                 else:
                     search_url = f"{base_url}/search?q={category}+{city}+pakistan"
                 
-                response = self.session.get(search_url, timeout=10)
-                response.raise_for_status()
+                content = self._fetch(search_url)
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = BeautifulSoup(content, 'html.parser')
                 
                 # Extract business listings (generic approach)
-                business_elements = soup.find_all(['div', 'li', 'tr'], class_=re.compile(r'(business|company|listing|item)', re.I))
+                business_elements = soup.select(_LISTING_SELECTOR)
                 
                 for elem in business_elements[:15]:  # Limit per source
                     business_data = self._extract_business_from_element(elem, category, city, source_name)
@@ -199,7 +329,7 @@ class FreeBusinessCollector:
         """Extract business information from HTML element"""
         try:
             # Try to find business name
-            name_elem = element.find(['h1', 'h2', 'h3', 'h4', 'strong', 'b'])
+            name_elem = element.select_one(_NAME_SELECTOR)
             if not name_elem:
                 return None
                 
@@ -215,29 +345,25 @@ class FreeBusinessCollector:
                 source=source
             )
             
-            # Try to extract contact information
-            text_content = element.get_text()
+            # Walk the subtree once; line breaks are kept so address matches stop at them
+            text_content = element.get_text('\n', strip=True)
             
             # Extract phone numbers
-            phone_patterns = [
-                r'\+92[\d\s-]+',
-                r'[\d\s-]{10,}',
-                r'Tel[:\s]*([\d\s-]+)',
-                r'Phone[:\s]*([\d\s-]+)'
-            ]
-            
-            for pattern in phone_patterns:
-                phone_match = re.search(pattern, text_content)
-                if phone_match:
-                    business.phone = phone_match.group(0).strip()
-                    break
+            business.phone = _find_phone(text_content)
             
             # Extract email addresses
-            email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text_content)
+            email_match = _EMAIL_RE.search(text_content)
             if email_match:
                 business.email = email_match.group(0)
             
-            # Extract website
+            # Extract address
+            for pattern in _ADDRESS_RES:
+                address_match = pattern.search(text_content)
+                if address_match:
+                    business.address = address_match.group(1).strip()
+                    break
+            
+            # Extract website (the only field that needs another tree search)
             website_elem = element.find('a', href=True)
             if website_elem:
                 href = website_elem['href']
@@ -246,19 +372,6 @@ class FreeBusinessCollector:
                 else:
                     business.website = urljoin(self.scraping_sources.get(source, ''), href)
             
-            # Extract address
-            address_patterns = [
-                r'Address[:\s]*([^,\n]+)',
-                r'Location[:\s]*([^,\n]+)',
-                r'([^,\n]+(?:Street|Road|Avenue|Lane|Plaza|Mall|Center))'
-            ]
-            
-            for pattern in address_patterns:
-                address_match = re.search(pattern, text_content)
-                if address_match:
-                    business.address = address_match.group(1).strip()
-                    break
-            
             return business
             
         except Exception as e:
@@ -301,10 +414,16 @@ class FreeBusinessCollector:
         """Remove duplicate businesses based on name and phone"""
         seen = set()
         unique_businesses = []
+        use_fingerprints = self.fingerprint_dedup and xxhash is not None
         
         for business in businesses:
-            # Create a unique identifier
-            identifier = f"{business.name.lower().strip()}_{business.phone or 'no_phone'}"
+            # Create a unique identifier from the name and the phone's digits
+            name_key = business.name.lower().strip()
+            phone_key = ''.join(ch for ch in business.phone if ch.isdigit()) if business.phone else 'no_phone'
+            if use_fingerprints:
+                identifier = xxhash.xxh3_64_intdigest(f"{name_key}\x00{phone_key}".encode())
+            else:
+                identifier = (name_key, phone_key)
             
             if identifier not in seen:
                 seen.add(identifier)
@@ -314,40 +433,26 @@ class FreeBusinessCollector:
     
     def _filter_businesses(self, businesses: List[BusinessData], category: str, city: str) -> List[BusinessData]:
         """Filter businesses based on relevance"""
-        filtered = []
+        category_lc = category.lower()
+        city_lc = city.strip().lower()
+        known_city = city_lc in _CITIES_LC
         
-        for business in businesses:
-            # Must have a name
-            if not business.name or len(business.name.strip()) < 3:
-                continue
-            
-            # Must be in the target city (case-insensitive)
-            if business.city and city.lower() not in business.city.lower():
-                continue
-            
-            # Must match category (case-insensitive)
-            if business.business_type and category.lower() not in business.business_type.lower():
-                continue
-            
-            filtered.append(business)
-        
-        return filtered
-    
-    def get_categories(self) -> List[str]:
-        """Get available business categories"""
+        # Keep businesses that have a name, are in the target city (exact match for
+        # known cities, substring otherwise) and match the category (case-insensitive)
         return [
-            "Technology", "Healthcare", "Education", "Finance", "Real Estate",
-            "Restaurant", "Retail", "Manufacturing", "Consulting", "Legal",
-            "Marketing", "Transportation", "Construction", "Entertainment", "Automotive"
+            b for b in businesses
+            if b.name and len(b.name.strip()) >= 3
+            and (not b.city or (b.city.strip().lower() == city_lc if known_city else city_lc in b.city.lower()))
+            and (not b.business_type or category_lc in b.business_type.lower())
         ]
     
-    def get_cities(self) -> List[str]:
+    def get_categories(self) -> Tuple[str, ...]:
+        """Get available business categories"""
+        return _CATEGORIES
+    
+    def get_cities(self) -> Tuple[str, ...]:
         """Get available cities in Pakistan"""
-        return [
-            "Karachi", "Lahore", "Islamabad", "Rawalpindi", "Faisalabad",
-            "Multan", "Peshawar", "Quetta", "Gujranwala", "Sialkot",
-            "Bahawalpur", "Sargodha", "Sukkur", "Jhang", "Sheikhupura"
-        ]
+        return _CITIES
     
     def get_scraping_statistics(self) -> Dict[str, Any]:
         """Get scraping statistics"""
@@ -355,15 +460,14 @@ class FreeBusinessCollector:
             "total_sources": len(self.scraping_sources),
             "free_apis_used": ["DuckDuckGo", "OpenStreetMap Nominatim"],
             "scraping_methods": ["Enhanced Directory Scraping", "Search Engine Results"],
-            "rate_limiting": f"{self.min_delay} second delay between requests"
+            "rate_limiting": f"Adaptive per-host delay ({self.delay_floor}-{self.max_delay} seconds, honours Retry-After)"
         }
 
 # Example usage
 if __name__ == "__main__":
-    collector = FreeBusinessCollector()
-    
-    # Test the collector
-    businesses = collector.collect_businesses("Technology", "Karachi", 10)
+    with FreeBusinessCollector() as collector:
+        # Test the collector
+        businesses = collector.collect_businesses("Technology", "Karachi", 10)
     
     print(f"Found {len(businesses)} businesses:")
     for business in businesses:
@@ -3,131 +3,208 @@
 Test script for Gemini integration in the Flask app
 """
 
-import requests
+import io
+import sys
+import asyncio
+import contextvars
+import aiohttp
 import json
 import time
 
-def test_gemini_lead_generation():
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    # Fallback: stdlib parser
+    _json_loads = json.loads
+
+# Same bounds as before: 3s to connect, 30s for each read from the Flask app
+TIMEOUT = aiohttp.ClientTimeout(total=None, connect=3, sock_read=30)
+
+# Literal IPv4 address: no name lookup, and no failed ::1 attempt against Flask's 0.0.0.0 bind
+_BASE = 'http://127.0.0.1:5000'
+_URL_LEADS = f'{_BASE}/api/generate_leads'
+_URL_CAMPAIGN = f'{_BASE}/api/generate_gemini_campaign'
+_URL_INSIGHTS = f'{_BASE}/api/get_gemini_insights'
+
+class _TaskBufferedStdout:
+    """Stdout that sends each test task's prints to its own buffer while one is set"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = contextvars.ContextVar('buffer', default=None)
+    
+    def write(self, text):
+        return (self.buffer.get() or self.stream).write(text)
+    
+    def flush(self):
+        (self.buffer.get() or self.stream).flush()
+    
+    async def run(self, test, session):
+        """Run a test with its output captured, returning (result, output)"""
+        buffer = io.StringIO()
+        self.buffer.set(buffer)  # gather runs each test in its own task, so this stays task-local
+        return await test(session), buffer.getvalue()
+
+async def test_gemini_lead_generation(session):
     """Test Gemini-powered lead generation"""
     print("🧠 Testing Gemini-Powered Lead Generation")
     print("=" * 50)
     
     try:
-        response = requests.post('http://localhost:5000/api/generate_leads', 
-                               json={
-                                   'category': 'Technology',
-                                   'city': 'Islamabad',
-                                   'target_count': 10,
-                                   'use_ai': True
-                               })
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data['success']:
-                print(f"✅ Success: {data['message']}")
-                print(f"📊 Generated {data['leads_count']} leads")
-                if 'ai_insights' in data:
-                    insights = data['ai_insights']
-                    print(f"🎯 High Priority: {insights['high_priority']}")
-                    print(f"🎯 Medium Priority: {insights['medium_priority']}")
-                    print(f"🎯 Low Priority: {insights['low_priority']}")
-                    print(f"📈 Average Lead Score: {insights['average_lead_score']}%")
-                return True
+        async with session.post(_URL_LEADS, 
+                                json={
+                                    'category': 'Technology',
+                                    'city': 'Islamabad',
+                                    'target_count': 10,
+                                    'use_ai': True
+                                }) as response:
+            if response.status == 200:
+                data = await response.json()
+                if data['success']:
+                    print(f"✅ Success: {data['message']}")
+                    print(f"📊 Generated {data['leads_count']} leads")
+                    if 'ai_insights' in data:
+                        insights = data['ai_insights']
+                        print(f"🎯 High Priority: {insights['high_priority']}")
+                        print(f"🎯 Medium Priority: {insights['medium_priority']}")
+                        print(f"🎯 Low Priority: {insights['low_priority']}")
+                        print(f"📈 Average Lead Score: {insights['average_lead_score']}%")
+                    return True
+                else:
+                    print(f"❌ Failed: {data['message']}")
+                    return False
             else:
-                print(f"❌ Failed: {data['message']}")
+                print(f"❌ HTTP Error: {response.status}")
                 return False
-        else:
-            print(f"❌ HTTP Error: {response.status_code}")
-            return False
             
-    except requests.exceptions.ConnectionError:
+    except asyncio.TimeoutError:
+        # Checked first: aiohttp's timeout errors are also connection errors
+        print("❌ Timeout: Flask app did not respond within the connect/read limits")
+        return False
+    except aiohttp.ClientConnectionError:
         print("❌ Connection Error: Make sure Flask app is running")
         return False
     except Exception as e:
         print(f"❌ Error: {e}")
         return False
 
-def test_gemini_campaign_generation():
+async def test_gemini_campaign_generation(session):
     """Test Gemini-powered campaign generation"""
     print("\n🎯 Testing Gemini-Powered Campaign Generation")
     print("=" * 50)
     
     try:
-        response = requests.post('http://localhost:5000/api/generate_gemini_campaign', 
-                               json={
-                                   'category': 'Technology',
-                                   'city': 'Islamabad',
-                                   'target_count': 10
-                               })
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data['success']:
-                print(f"✅ Success: {data['message']}")
-                print(f"📧 Generated {data['email_templates_count']} email templates")
-                if 'email_templates' in data:
-                    for i, template in enumerate(data['email_templates'], 1):
-                        print(f"   {i}. Subject: {template['subject']}")
-                return True
+        async with session.post(_URL_CAMPAIGN, 
+                                json={
+                                    'category': 'Technology',
+                                    'city': 'Islamabad',
+                                    'target_count': 10
+                                }) as response:
+            if response.status == 200:
+                data = await response.json()
+                if data['success']:
+                    print(f"✅ Success: {data['message']}")
+                    print(f"📧 Generated {data['email_templates_count']} email templates")
+                    if 'email_templates' in data:
+                        for i, template in enumerate(data['email_templates'], 1):
+                            print(f"   {i}. Subject: {template['subject']}")
+                    return True
+                else:
+                    print(f"❌ Failed: {data['message']}")
+                    return False
             else:
-                print(f"❌ Failed: {data['message']}")
+                print(f"❌ HTTP Error: {response.status}")
                 return False
-        else:
-            print(f"❌ HTTP Error: {response.status_code}")
-            return False
             
-    except requests.exceptions.ConnectionError:
+    except asyncio.TimeoutError:
+        # Checked first: aiohttp's timeout errors are also connection errors
+        print("❌ Timeout: Flask app did not respond within the connect/read limits")
+        return False
+    except aiohttp.ClientConnectionError:
         print("❌ Connection Error: Make sure Flask app is running")
         return False
     except Exception as e:
         print(f"❌ Error: {e}")
         return False
 
-def test_gemini_insights():
+async def test_gemini_insights(session):
     """Test Gemini insights endpoint"""
     print("\n📊 Testing Gemini Insights")
     print("=" * 50)
     
     try:
-        response = requests.get('http://localhost:5000/api/get_gemini_insights')
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data['success']:
-                print(f"✅ Success: {data['message']}")
-                insights = data['insights']
-                print(f"📈 Total Leads: {insights['total_leads']}")
-                print(f"✅ Verified Leads: {insights['verified_leads']}")
-                print(f"📊 Verification Rate: {insights['verification_rate']}%")
-                if insights['categories']:
-                    print(f"🏷️ Categories: {', '.join(insights['categories'])}")
-                if insights['cities']:
-                    print(f"🏙️ Cities: {', '.join(insights['cities'])}")
-                return True
+        async with session.get(_URL_INSIGHTS) as response:
+            if response.status == 200:
+                data = _json_loads(await response.read())
+                if data['success']:
+                    print(f"✅ Success: {data['message']}")
+                    insights = data['insights']
+                    print(f"📈 Total Leads: {insights['total_leads']}")
+                    print(f"✅ Verified Leads: {insights['verified_leads']}")
+                    print(f"📊 Verification Rate: {insights['verification_rate']}%")
+                    if insights['categories']:
+                        print(f"🏷️ Categories: {', '.join(insights['categories'])}")
+                    if insights['cities']:
+                        print(f"🏙️ Cities: {', '.join(insights['cities'])}")
+                    return True
+                else:
+                    print(f"❌ Failed: {data['message']}")
+                    return False
             else:
-                print(f"❌ Failed: {data['message']}")
+                print(f"❌ HTTP Error: {response.status}")
                 return False
-        else:
-            print(f"❌ HTTP Error: {response.status_code}")
-            return False
             
-    except requests.exceptions.ConnectionError:
+    except asyncio.TimeoutError:
+        # Checked first: aiohttp's timeout errors are also connection errors
+        print("❌ Timeout: Flask app did not respond within the connect/read limits")
+        return False
+    except aiohttp.ClientConnectionError:
         print("❌ Connection Error: Make sure Flask app is running")
         return False
     except Exception as e:
         print(f"❌ Error: {e}")
         return False
 
+async def run_tests(stdout, tests):
+    """Run the tests concurrently over one keep-alive connection pool"""
+    # Any hostname in _BASE is resolved once for the whole run instead of every 10s (the aiohttp default)
+    connector = aiohttp.TCPConnector(limit=4, force_close=False, keepalive_timeout=30, ttl_dns_cache=None)
+    async with aiohttp.ClientSession(connector=connector, timeout=TIMEOUT) as session:
+        # Pay for DNS, the TCP handshake and Flask's first request up front so no test absorbs them;
+        # the warmed connection goes back to the pool for the tests to reuse
+        try:
+            async with session.get(f'{_BASE}/', timeout=aiohttp.ClientTimeout(total=5)) as response:
+                await response.read()
+        except Exception:
+            pass
+        return await asyncio.gather(*(stdout.run(test, session) for test in tests))
+
 def main():
     print("🚀 Gemini Integration Test Suite")
     print("=" * 60)
-    print("Make sure your Flask app is running on http://localhost:5000")
+    print(f"Make sure your Flask app is running on {_BASE}")
     print("=" * 60)
     
+    tests = {
+        'lead_gen': test_gemini_lead_generation,
+        'campaign_gen': test_gemini_campaign_generation,
+        'insights': test_gemini_insights
+    }
+    
+    # The tests only wait on the Flask app, so run them at once on one event loop; each
+    # test's output is buffered and printed in order once everything has finished
+    stdout = _TaskBufferedStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        outcomes = dict(zip(tests, asyncio.run(run_tests(stdout, tests.values()))))
+    finally:
+        sys.stdout = stdout.stream
+    
     results = {}
-    results['lead_gen'] = test_gemini_lead_generation()
-    results['campaign_gen'] = test_gemini_campaign_generation()
-    results['insights'] = test_gemini_insights()
+    for test_name, (result, output) in outcomes.items():
+        print(output, end='')
+        results[test_name] = result
     
     print("\n" + "=" * 60)
     print("📋 Test Results Summary")